@@ -17,8 +17,8 @@ DISEASES = [
 ]
 
 
-def create_bayesian_network():
-    """Builds Bayesian Network"""
+def create_bayesian_network(learned_cpds=None):
+    """Builds Bayesian Network, optionally from CPDs learned by CPDLearning.py"""
 
     edges = (
             [(symptom, disease) for symptom in CORE_SYMPTOMS for disease in DISEASES] +
@@ -26,6 +26,13 @@ def create_bayesian_network():
     )
     model = DiscreteBayesianNetwork(edges)
 
+    if learned_cpds is not None:
+        model.add_cpds(*learned_cpds)
+        if model.check_model():
+            print("Bayesian Network created from learned CPDs")
+            return model, DISEASES
+        raise ValueError("Model check failed")
+
     symptom_cpds = [
         TabularCPD(
             variable=s,
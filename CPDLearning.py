@@ -0,0 +1,155 @@
+"""
+Task 10: CPD Learning from Patient Records
+- Streams a patient-outcome CSV in chunks and counts parent configurations with bincount.
+- Applies Dirichlet smoothing to produce TabularCPDs with the same layout as BayesianNetwork.py.
+- Counts from separate shards can be merged, so large datasets can be counted in parallel.
+
+Expected CSV columns: Fever, Cough, Fatigue, Headache, AgeGroup, Location
+and one yes/no column per disease. Blank or unknown values are skipped.
+"""
+from functools import reduce
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+from pgmpy.factors.discrete import TabularCPD
+
+from BayesianNetwork import CORE_SYMPTOMS, DEMOGRAPHICS, DISEASES
+
+PARENTS = CORE_SYMPTOMS + DEMOGRAPHICS
+STATE_NAMES = {
+    **{s: ['no', 'yes'] for s in CORE_SYMPTOMS},
+    'AgeGroup': ['child', 'adult', 'elderly'],
+    'Location': ['urban', 'rural', 'tropical'],
+    **{d: ['no', 'yes'] for d in DISEASES}
+}
+
+
+def encode_column(column, states):
+    """Maps a column of state names to indices, with -1 for blank or unknown values."""
+    values = column.astype('string').str.strip().str.lower()
+    return pd.Categorical(values, categories=states).codes.astype(np.int64)
+
+
+class CPDCounts:
+    """Sufficient statistics for the root priors and disease CPDs."""
+
+    def __init__(self, diseases=DISEASES):
+        self.diseases = list(diseases)
+        self.cards = [len(STATE_NAMES[p]) for p in PARENTS]
+        self.n_configs = int(np.prod(self.cards))
+        self.strides = np.cumprod([1] + self.cards[:0:-1])[::-1]
+        self.parent_counts = [np.zeros(card, dtype=np.int64) for card in self.cards]
+        self.disease_counts = np.zeros((len(self.diseases), self.n_configs, 2), dtype=np.int64)
+        self.rows = 0
+        self.complete_rows = 0
+
+    def update(self, chunk):
+        """Accumulates counts from one DataFrame chunk of patient records."""
+        codes = np.column_stack([encode_column(chunk[p], STATE_NAMES[p]) for p in PARENTS])
+        for j, card in enumerate(self.cards):
+            column = codes[:, j]
+            self.parent_counts[j] += np.bincount(column[column >= 0], minlength=card)
+
+        complete = (codes >= 0).all(axis=1)
+        self.complete_rows += int(complete.sum())
+        config = codes @ self.strides
+        for i, disease in enumerate(self.diseases):
+            if disease not in chunk:
+                continue
+            outcome = encode_column(chunk[disease], STATE_NAMES[disease])
+            valid = complete & (outcome >= 0)
+            self.disease_counts[i] += np.bincount(
+                config[valid] * 2 + outcome[valid], minlength=self.n_configs * 2
+            ).reshape(self.n_configs, 2)
+
+        self.rows += len(chunk)
+        return self
+
+    def merge(self, other):
+        """Adds the counts of another CPDCounts (e.g. from a different shard)."""
+        if other.diseases != self.diseases:
+            raise ValueError("Cannot merge counts over different diseases")
+        for mine, theirs in zip(self.parent_counts, other.parent_counts):
+            mine += theirs
+        self.disease_counts += other.disease_counts
+        self.rows += other.rows
+        self.complete_rows += other.complete_rows
+        return self
+
+    def to_cpds(self, pseudocount=1.0):
+        """Builds smoothed TabularCPDs for every root and disease node."""
+        if pseudocount < 0:
+            raise ValueError("pseudocount must be non-negative")
+        missing = [d for d, counts in zip(self.diseases, self.disease_counts) if not counts.any()]
+        if missing:
+            raise ValueError(f"No usable records for diseases: {', '.join(missing)}")
+
+        cpds = []
+        for parent, counts in zip(PARENTS, self.parent_counts):
+            probs = normalize(counts + pseudocount)
+            cpds.append(TabularCPD(
+                variable=parent,
+                variable_card=len(probs),
+                values=probs.reshape(-1, 1).tolist(),
+                state_names={parent: STATE_NAMES[parent]}
+            ))
+
+        for disease, counts in zip(self.diseases, self.disease_counts):
+            probs = normalize(counts + pseudocount, axis=1)
+            cpds.append(TabularCPD(
+                variable=disease,
+                variable_card=2,
+                values=probs.T.tolist(),
+                evidence=PARENTS,
+                evidence_card=self.cards,
+                state_names={p: STATE_NAMES[p] for p in [disease] + PARENTS}
+            ))
+        return cpds
+
+
+def normalize(counts, axis=0):
+    """Normalizes counts to probabilities, falling back to uniform where all are zero."""
+    counts = np.asarray(counts, dtype=float)
+    totals = counts.sum(axis=axis, keepdims=True)
+    uniform = np.full_like(counts, 1.0 / counts.shape[axis])
+    return np.divide(counts, totals, out=uniform, where=totals > 0)
+
+
+def count_csv(path, chunksize=100000, diseases=DISEASES):
+    """Streams one CSV file and returns its CPDCounts. Memory is bounded by chunksize."""
+    counts = CPDCounts(diseases)
+    for chunk in pd.read_csv(path, chunksize=chunksize, dtype=str, keep_default_na=True):
+        counts.update(chunk)
+    return counts
+
+
+def count_shards(paths, chunksize=100000, processes=None):
+    """Counts several CSV shards in parallel and merges the results."""
+    with Pool(processes) as pool:
+        shard_counts = pool.starmap(count_csv, [(path, chunksize) for path in paths])
+    return reduce(CPDCounts.merge, shard_counts)
+
+
+def learn_cpds(paths, chunksize=100000, pseudocount=1.0, processes=None):
+    """Learns all CPDs from one CSV path or a list of shard paths."""
+    if isinstance(paths, str):
+        counts = count_csv(paths, chunksize)
+    else:
+        counts = count_shards(paths, chunksize, processes)
+    print(f"Learned CPDs from {counts.complete_rows} complete patient records "
+          f"({counts.rows - counts.complete_rows} skipped for blank or unknown symptoms/demographics)")
+    return counts.to_cpds(pseudocount)
+
+
+if __name__ == "__main__":
+    import sys
+    from BayesianNetwork import create_bayesian_network
+
+    if len(sys.argv) < 2:
+        print("Usage: python CPDLearning.py records.csv [more_shards.csv ...]")
+        sys.exit(1)
+
+    shards = sys.argv[1:]
+    bn_model, _ = create_bayesian_network(learn_cpds(shards[0] if len(shards) == 1 else shards))
+    print(bn_model.get_cpds('Flu'))
@@ -1,6 +1,9 @@
 from BayesianNetwork import create_bayesian_network
+from BatchInference import BatchInferenceEngine, MISSING
+from SymptomRecommender import recommend_next_symptoms
 from neo4j import GraphDatabase
 from pgmpy.inference import VariableElimination
+import numpy as np
 import re
 
 DISEASES = [
@@ -19,6 +22,7 @@ class MedicalSystem:
         self.bn_model, _ = create_bayesian_network()
         self.inference = VariableElimination(self.bn_model)
         self.inference.LOG_PROGRESS = False
+        self.batch_engine = BatchInferenceEngine(self.bn_model)
 
         self.symptom_mappings = {
             'high fever': 'Fever',
@@ -116,6 +120,19 @@ class MedicalSystem:
                 probabilities[disease] = 0
         return probabilities
 
+    def start_session(self, symptoms=(), age='adult', location='urban'):
+        """Start an incremental diagnosis session for one patient"""
+        session = DiagnosisSession(self, age, location)
+        for symptom in symptoms:
+            session.add_symptom(symptom)
+        return session
+
+    def diagnose(self, symptoms, age='adult', location='urban'):
+        """Ranked diagnosis results without printing"""
+        neo4j_scores = self.get_neo4j_severity(symptoms)
+        bayesian_probs = self.get_bayesian_probabilities(symptoms, age, location)
+        return rank_diseases(neo4j_scores, bayesian_probs)
+
     def run_diagnosis(self, symptoms, age='adult', location='urban'):
         """Combined diagnosis with enhanced output"""
         if not symptoms:
@@ -124,50 +141,194 @@ class MedicalSystem:
 
         print(f"\n Analyzing {len(symptoms)} symptoms...")
 
-        neo4j_scores = self.get_neo4j_severity(symptoms)
-        bayesian_probs = self.get_bayesian_probabilities(symptoms, age, location)
-
-        results = []
-        for disease in set(neo4j_scores.keys()).union(bayesian_probs.keys()):
-            results.append({
-                'disease': disease,
-                'severity': neo4j_scores.get(disease, 0),
-                'probability': bayesian_probs.get(disease, 0),
-                'combined_score': neo4j_scores.get(disease, 0) * bayesian_probs.get(disease, 0)
-            })
-        results.sort(key=lambda x: x['combined_score'], reverse=True)
-
-        print("\n🏥 Diagnosis Results:")
-        for idx, result in enumerate(results[:2], 1):
-            print(f"{idx}. {result['disease']}:")
-            print(f"   - Probability: {result['probability'] * 100:.1f}%")
-            print(f"   - Severity: {'★' * int(result['severity'])}")
-            print(f"   - Key Symptoms: {', '.join(symptoms[:3])}")
+        results = self.diagnose(symptoms, age, location)
+        print_results(results, symptoms)
+        return results
 
     def interactive_diagnosis(self):
         """Enhanced interactive interface"""
         print("\n Interactive Medical Diagnosis")
+        session = None
         while True:
             print("\nOptions:")
             print("1. Enter symptoms (comma-separated)")
             print("2. Parse complex sentence")
-            print("3. Exit")
+            print("3. Add symptom to current patient")
+            print("4. Remove symptom from current patient")
+            print("5. Exit")
 
             choice = input("Select: ").strip()
 
             if choice == '1':
                 symptoms = self.validate_symptoms(input("Symptoms: ").split(','))
-                self.run_diagnosis(symptoms)
+                session = self.start_session(symptoms)
             elif choice == '2':
                 parsed = self.parse_complex_sentence(input("Enter sentence: "))
                 print(f"\nParsed: {parsed['patient']} | Symptoms: {', '.join(parsed['symptoms'])}")
                 if parsed['suspected_diseases']:
                     print(f"Suspected: {', '.join(parsed['suspected_diseases'])}")
-                self.run_diagnosis(parsed['symptoms'])
-            elif choice == '3':
+                session = self.start_session(parsed['symptoms'])
+            elif choice in ('3', '4'):
+                if session is None:
+                    print(" Enter symptoms first")
+                    continue
+                for symptom in self.validate_symptoms(input("Symptom: ").split(',')):
+                    if choice == '3':
+                        session.add_symptom(symptom)
+                    else:
+                        session.retract_symptom(symptom)
+            elif choice == '5':
                 break
             else:
                 print(" Invalid choice")
+                continue
+
+            if session is not None:
+                if session.symptoms:
+                    print(f"\n Analyzing {len(session.symptoms)} symptoms...")
+                print_results(session.results(), session.symptoms)
+                print_recommendations(session.recommendations())
+
+
+class DiagnosisSession:
+    """Diagnosis for one patient, updated incrementally as evidence changes"""
+
+    def __init__(self, system, age='adult', location='urban'):
+        self.system = system
+        self.engine = system.batch_engine
+        self.symptoms = []
+        self.codes = np.full(len(self.engine.parents), MISSING, dtype=np.int64)
+        self.severity = {}
+        self._edge_counts = {}
+        self._unmodelled = set()
+        self._edges = {}
+        self._posteriors = {}
+        self.set_demographic('AgeGroup', age)
+        self.set_demographic('Location', location)
+
+    def _severity_edges(self, symptom):
+        # Cached per session, so a new session picks up changes to the graph
+        if symptom not in self._edges:
+            self._edges[symptom] = self.system.get_neo4j_severity([symptom])
+        return self._edges[symptom]
+
+    def _set_code(self, variable, state):
+        j = self.engine.parents.index(variable)
+        if state is None:
+            self.codes[j] = MISSING
+        else:
+            states = self.engine.state_names[variable]
+            if state.lower() not in states:
+                raise ValueError(f"Unknown {variable} '{state}', expected one of {states}")
+            self.codes[j] = states.index(state.lower())
+
+    def add_symptom(self, symptom):
+        if symptom in self.symptoms:
+            return
+        self.symptoms.append(symptom)
+        for disease, weight in self._severity_edges(symptom).items():
+            self.severity[disease] = self.severity.get(disease, 0) + weight
+            self._edge_counts[disease] = self._edge_counts.get(disease, 0) + 1
+        if symptom in self.engine.parents:
+            self._set_code(symptom, 'yes')
+        else:
+            self._unmodelled.add(symptom)
+
+    def retract_symptom(self, symptom):
+        if symptom not in self.symptoms:
+            return
+        self.symptoms.remove(symptom)
+        for disease, weight in self._severity_edges(symptom).items():
+            self._edge_counts[disease] -= 1
+            if self._edge_counts[disease]:
+                self.severity[disease] -= weight
+            else:
+                del self._edge_counts[disease]
+                del self.severity[disease]
+        if symptom in self.engine.parents:
+            self._set_code(symptom, None)
+        else:
+            self._unmodelled.discard(symptom)
+
+    def set_demographic(self, variable, value):
+        """Set 'AgeGroup' or 'Location'; None marginalizes it out of the network"""
+        self._set_code(variable, value)
+
+    def retract_demographic(self, variable):
+        self._set_code(variable, None)
+
+    def evidence(self):
+        return {
+            parent: self.engine.state_names[parent][code]
+            for parent, code in zip(self.engine.parents, self.codes) if code != MISSING
+        }
+
+    def probabilities(self):
+        # Like get_bayesian_probabilities, evidence outside the network yields zeros
+        if self._unmodelled:
+            return dict.fromkeys(DISEASES, 0)
+        key = tuple(self.codes)
+        if key not in self._posteriors:
+            probs = self.engine.posteriors(self.codes[None])[0]
+            self._posteriors[key] = dict(zip(self.engine.diseases, probs.tolist()))
+        return self._posteriors[key]
+
+    def results(self):
+        return rank_diseases(self.severity, self.probabilities())
+
+    def matches_run_diagnosis(self):
+        """Check the ranked results against a fresh diagnosis on the same evidence"""
+        evidence = self.evidence()
+        if 'AgeGroup' not in evidence or 'Location' not in evidence:
+            raise ValueError("run_diagnosis requires both AgeGroup and Location")
+        fresh = self.system.diagnose(self.symptoms, evidence['AgeGroup'], evidence['Location'])
+        current = self.results()
+        return len(fresh) == len(current) and all(
+            a['disease'] == b['disease'] and a['severity'] == b['severity']
+            and abs(a['probability'] - b['probability']) <= 1e-9
+            for a, b in zip(fresh, current)
+        )
+
+    def recommendations(self):
+        """Rank unasked symptoms by expected reduction in diagnostic uncertainty"""
+        # Results are all zero with evidence outside the network, so there is nothing to refine
+        if self._unmodelled:
+            return []
+        return recommend_next_symptoms(self.engine, self.evidence())
+
+
+def rank_diseases(neo4j_scores, bayesian_probs):
+    results = []
+    for disease in set(neo4j_scores.keys()).union(bayesian_probs.keys()):
+        results.append({
+            'disease': disease,
+            'severity': neo4j_scores.get(disease, 0),
+            'probability': bayesian_probs.get(disease, 0),
+            'combined_score': neo4j_scores.get(disease, 0) * bayesian_probs.get(disease, 0)
+        })
+    # Rounded so float noise between inference engines cannot reorder ties
+    results.sort(key=lambda x: (-round(x['combined_score'], 12), x['disease']))
+    return results
+
+
+def print_results(results, symptoms):
+    if not symptoms:
+        print(" No valid symptoms provided!")
+        return
+
+    print("\n🏥 Diagnosis Results:")
+    for idx, result in enumerate(results[:2], 1):
+        print(f"{idx}. {result['disease']}:")
+        print(f"   - Probability: {result['probability'] * 100:.1f}%")
+        print(f"   - Severity: {'★' * int(result['severity'])}")
+        print(f"   - Key Symptoms: {', '.join(symptoms[:3])}")
+
+
+def print_recommendations(recommendations):
+    if recommendations:
+        print("\n Consider asking about:")
+        for symptom, gain in recommendations[:3]:
+            print(f"   - {symptom} (expected information gain: {gain:.3f} bits)")
 
 
 if __name__ == "__main__":